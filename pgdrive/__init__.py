@@ -2,8 +2,18 @@ __author__ = "Horatiu Bota"
 __email__ = "52171232+horatiubota@users.noreply.github.com"
 __version__ = "0.0.0"
 
-from .read import read_drive
+from .bulk import upload_many
+from .find import clear_caches
+from .read import iter_drive, read_drive
 from .upload import upload_file
 from .write import to_drive
 
-__all__ = ["read_drive", "to_drive", "upload_file", "__version__"]
+__all__ = [
+    "clear_caches",
+    "iter_drive",
+    "read_drive",
+    "to_drive",
+    "upload_file",
+    "upload_many",
+    "__version__",
+]
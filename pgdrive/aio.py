@@ -0,0 +1,256 @@
+import asyncio
+import io
+import json
+import mimetypes
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+import google_auth_httplib2
+import httplib2
+import pandas as pd
+
+from .find import find_drive_id, split_drive_path
+from .read import _parse_url, _to_dataframe
+from .service import (
+    GOOGLE_DRIVE_USER_AGENT,
+    MIME_TYPE_EXCEL_SPREADSHEET,
+    RETRY_ATTEMPTS,
+    PandasGoogleDriveException,
+    get_service_credentials,
+    is_transient,
+    retry_delay,
+)
+from .write import create_folders
+
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files"
+DRIVE_UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files"
+
+# stay well below the Google Drive per-user request quota
+MAX_CONCURRENT_REQUESTS = 10
+
+
+def _get_token() -> str:
+    """
+    Returns a valid access token for the service account, refreshing it if needed.
+    """
+    credentials = get_service_credentials()
+    if not credentials.valid:
+        credentials.refresh(google_auth_httplib2.Request(httplib2.Http()))
+
+    return credentials.token
+
+
+async def _new_session() -> aiohttp.ClientSession:
+    """
+    Creates an HTTP session that authenticates all requests with the same token.
+    """
+    # refreshing the token blocks, keep it off the event loop
+    token = await asyncio.get_running_loop().run_in_executor(None, _get_token)
+
+    return aiohttp.ClientSession(
+        headers={
+            "Authorization": f"Bearer {token}",
+            "User-Agent": GOOGLE_DRIVE_USER_AGENT,
+        }
+    )
+
+
+async def _request(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    method: str,
+    url: str,
+    data: Optional[Callable[[], Any]] = None,
+    **kwargs,
+) -> bytes:
+    """
+    Sends an HTTP request and returns the response body. Rate limited and transient
+    Google Drive errors are retried like `service.retry` does. The request body is
+    created by calling `data`, once per attempt, as a body can only be sent once.
+
+    Raises:
+        aiohttp.ClientResponseError: Raised when the error is not transient or all
+            attempts fail.
+    """
+    attempt = 0
+    while True:
+        async with semaphore, session.request(
+            method, url, data=data() if data else None, **kwargs
+        ) as response:
+            content = await response.read()
+            if response.ok:
+                return content
+
+            retry_after = response.headers.get("Retry-After")
+            error = aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=response.reason or "",
+                headers=response.headers,
+            )
+
+        attempt += 1
+        if attempt >= RETRY_ATTEMPTS or not is_transient(error.status, content):
+            raise error
+
+        await asyncio.sleep(retry_delay(attempt, retry_after))
+
+
+async def _download(
+    session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str
+) -> io.BytesIO:
+    """
+    Downloads file stored on Google Drive.
+    """
+    file_type, file_id = _parse_url(url)
+
+    # Google spreadsheets need to be downloaded using the export method
+    if file_type == "spreadsheets":
+        request_url = f"{DRIVE_FILES_URL}/{file_id}/export"
+        params = {"mimeType": MIME_TYPE_EXCEL_SPREADSHEET}
+    else:
+        request_url = f"{DRIVE_FILES_URL}/{file_id}"
+        params = {"alt": "media", "supportsAllDrives": "true"}
+
+    try:
+        return io.BytesIO(
+            await _request(session, semaphore, "GET", request_url, params=params)
+        )
+    except aiohttp.ClientError as e:
+        raise PandasGoogleDriveException(f"Unable to download file: {url}") from e
+
+
+def _create_parent_folders(drive: str, folders: List[str]) -> Tuple[Optional[str], str]:
+    """
+    Finds the drive ID and creates the folder tree of an upload destination.
+    """
+    drive_id = find_drive_id(drive)
+    return create_folders(folders, drive_id=drive_id), drive_id
+
+
+async def _upload(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    local_path: Path,
+    drive_path: str,
+) -> str:
+    """
+    Uploads a local file to Google Drive using a multipart upload, streaming the
+    file from disk.
+    """
+    drive, folders, file_name = split_drive_path(drive_path)
+
+    # folders are created with the blocking client, keep it off the event loop
+    parent_folder_id, drive_id = await asyncio.get_running_loop().run_in_executor(
+        None, _create_parent_folders, drive, folders
+    )
+
+    metadata = {
+        "name": file_name,
+        "driveId": drive_id,
+        "parents": [parent_folder_id] if parent_folder_id else None,
+    }
+    mime_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+    def body() -> aiohttp.MultipartWriter:
+        # aiohttp streams (and then closes) the opened file
+        writer = aiohttp.MultipartWriter("related")
+        writer.append_json(metadata)
+        writer.append(local_path.open("rb"), {"Content-Type": mime_type})
+        return writer
+
+    params = {
+        "uploadType": "multipart",
+        "supportsAllDrives": "true",
+        "fields": "id,webViewLink",
+    }
+
+    try:
+        response = await _request(
+            session, semaphore, "POST", DRIVE_UPLOAD_URL, data=body, params=params
+        )
+    except aiohttp.ClientError as e:
+        raise PandasGoogleDriveException(f"Unable to upload {local_path}.") from e
+
+    file_url = json.loads(response).get("webViewLink")
+    if not file_url or not isinstance(file_url, str):
+        raise PandasGoogleDriveException(
+            f"Unable to get uploaded file URL for {local_path}."
+        )
+
+    return file_url
+
+
+async def read_drive_many_async(urls: Iterable[str], **kwargs) -> List[pd.DataFrame]:
+    """
+    Reads files from Google Drive into Pandas DataFrames, downloading them
+    concurrently.
+
+    Args:
+        urls (Iterable[str]): Google Drive file or spreadsheet URLs.
+        **kwargs: Passed on to `pandas.read_csv` or `pandas.read_excel`.
+
+    Returns:
+        List[pd.DataFrame]: DataFrames, in the same order as `urls`.
+    """
+    urls = list(urls)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async with await _new_session() as session:
+        contents = await asyncio.gather(
+            *(_download(session, semaphore, url) for url in urls)
+        )
+
+    return [
+        _to_dataframe(content, url, **kwargs) for content, url in zip(contents, urls)
+    ]
+
+
+def read_drive_many(urls: Iterable[str], **kwargs) -> List[pd.DataFrame]:
+    """
+    Reads files from Google Drive into Pandas DataFrames, downloading them
+    concurrently. See `read_drive_many_async`.
+    """
+    return asyncio.run(read_drive_many_async(urls, **kwargs))
+
+
+async def upload_files_async(
+    pairs: Iterable[Tuple[Union[str, Path], str]]
+) -> List[str]:
+    """
+    Uploads local files to Google Drive concurrently. Destination folders are
+    created in worker threads, so they do not block the event loop.
+
+    Args:
+        pairs (Iterable[Tuple[Union[str, Path], str]]): Pairs of local path and
+            Google Drive path. First part of a Drive path is the drive name. Must
+            include file name: "drive_name/folder1/folder2/file_name.zip".
+
+    Returns:
+        List[str]: Google Drive URLs of uploaded files, in the same order as `pairs`.
+    """
+    targets = []
+    for local_path, drive_path in pairs:
+        local_path = Path(local_path) if isinstance(local_path, str) else local_path
+        if not local_path.exists():
+            raise FileNotFoundError(f"File {local_path} does not exist.")
+
+        # fail on invalid paths before starting any upload
+        split_drive_path(drive_path)
+        targets.append((local_path, drive_path))
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async with await _new_session() as session:
+        return await asyncio.gather(
+            *(_upload(session, semaphore, *target) for target in targets)
+        )
+
+
+def upload_files(pairs: Iterable[Tuple[Union[str, Path], str]]) -> List[str]:
+    """
+    Uploads local files to Google Drive concurrently. See `upload_files_async`.
+    """
+    return asyncio.run(upload_files_async(pairs))
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+from .find import find_drive_id, split_drive_path
+from .upload import upload_file
+
+# stay well below the Google Drive per-user request quota
+MAX_WORKERS = 8
+
+
+def upload_many(
+    pairs: Iterable[Tuple[Union[str, Path], str]], max_workers: int = MAX_WORKERS
+) -> List[str]:
+    """
+    Uploads local files to Google Drive using a pool of threads. Folders shared by
+    several destination paths are only created once.
+
+    Args:
+        pairs (Iterable[Tuple[Union[str, Path], str]]): Pairs of local path and
+            Google Drive path. First part of a Drive path is the drive name. Must
+            include file name: "drive_name/folder1/folder2/file_name.zip".
+        max_workers (int, optional): Number of concurrent uploads. Defaults to 8.
+
+    Returns:
+        List[str]: Google Drive URLs of uploaded files, in the same order as `pairs`.
+    """
+
+    pairs = list(pairs)
+    local_paths = [local_path for local_path, _ in pairs]
+    drive_paths = [drive_path for _, drive_path in pairs]
+
+    # resolve each drive once, instead of concurrently from every thread
+    for drive in {split_drive_path(drive_path)[0] for drive_path in drive_paths}:
+        find_drive_id(drive)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(upload_file, local_paths, drive_paths))
@@ -1,9 +1,85 @@
+import threading
+import time
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from googleapiclient.errors import HttpError
 
-from .service import MIME_TYPE_FOLDER, PandasGoogleDriveException, get_service
+from .service import (
+    MIME_TYPE_FOLDER,
+    PandasGoogleDriveException,
+    execute_batch,
+    get_files,
+    get_service,
+    retry,
+)
+
+# folder IDs found or created are cached for a limited time, as folders can be
+# moved or deleted outside pgdrive
+FOLDER_CACHE_SIZE = 512
+FOLDER_CACHE_TTL = 300
+
+_folder_cache: Dict[Tuple[str, Optional[str], str], Tuple[float, str]] = {}
+_folder_cache_lock = threading.Lock()
+
+# bulk folder lookups fetch a single page of folders with the same name; names
+# with more matches are looked up level by level, filtered by parent folder
+FOLDER_PAGE_SIZE = 100
+
+
+def get_cached_folder_id(
+    name: str, parent_folder_id: Optional[str], drive_id: str
+) -> Optional[str]:
+    """
+    Returns the cached ID of a folder, if it is cached and has not expired.
+    """
+    key = (name, parent_folder_id, drive_id)
+
+    with _folder_cache_lock:
+        if not (entry := _folder_cache.pop(key, None)):
+            return None
+
+        expiry, folder_id = entry
+        if expiry < time.monotonic():
+            return None
+
+        # re-insert to mark as most recently used
+        _folder_cache[key] = entry
+        return folder_id
+
+
+def cache_folder_id(
+    name: str, parent_folder_id: Optional[str], drive_id: str, folder_id: str
+) -> None:
+    """
+    Caches the ID of a folder found or created in the given parent folder.
+    """
+    key = (name, parent_folder_id, drive_id)
+
+    with _folder_cache_lock:
+        _folder_cache.pop(key, None)
+        _folder_cache[key] = (time.monotonic() + FOLDER_CACHE_TTL, folder_id)
+
+        # evict least recently used folders
+        while len(_folder_cache) > FOLDER_CACHE_SIZE:
+            del _folder_cache[next(iter(_folder_cache))]
+
+
+def _escape(value: str) -> str:
+    """
+    Escapes a value for use as a quoted string in Google Drive search queries.
+    """
+    return value.replace("\\", "\\\\").replace("'", "\\'")
+
+
+def clear_caches() -> None:
+    """
+    Clears cached drive and folder IDs, e.g. after folders were moved or deleted.
+    """
+    find_drive_id.cache_clear()
+
+    with _folder_cache_lock:
+        _folder_cache.clear()
 
 
 @lru_cache
@@ -15,17 +91,15 @@ def find_drive_id(name: str) -> str:
     service = get_service()
 
     try:
-        drives = (
-            service.drives().list(fields="drives(id, name)").execute().get("drives")
+        request = service.drives().list(
+            q=f"name = '{_escape(name)}'", fields="drives(id)", pageSize=1
         )
+        drives = retry(request.execute).get("drives")
     except HttpError as e:
         raise PandasGoogleDriveException("Unable to list Google Drives.") from e
 
-    if drives is None:
-        raise PandasGoogleDriveException("No Google Drives accessible.")
-
-    if drive := next(filter(lambda drive: drive.get("name") == name, drives)):
-        return drive.get("id")
+    if drives:
+        return drives[0].get("id")
 
     raise PandasGoogleDriveException(
         f"No Google Drive with name {name} found for account."
@@ -54,25 +128,27 @@ def find_resource(
         query parameters.
 
     Returns:
-        dict: Dictionary containing resource `name` and `id`.
+        dict: Dictionary containing resource `name`, `id`, `md5Checksum` (binary files
+            only) and `webViewLink`.
     """
 
-    service = get_service().files()
+    service = get_files()
     query = (
-        f"name = '{name}' "
-        + (f"and parents in '{parent_folder_id}' " if parent_folder_id else "")
+        f"name = '{_escape(name)}' "
+        + (f"and '{_escape(parent_folder_id)}' in parents " if parent_folder_id else "")
         + (f"and trashed = {str(trashed or False).lower()} ")
         + (f"and mimeType = '{mime_type}'" if mime_type else "")
     )
 
-    response = service.list(
+    request = service.list(
         q=query,
-        fields="files(id, name)",
+        fields="files(id, name, md5Checksum, webViewLink)",
         corpora="drive",
         supportsAllDrives=True,
         includeItemsFromAllDrives=True,
         driveId=drive_id,
-    ).execute()
+    )
+    response = retry(request.execute)
 
     if files := response.get("files"):
         if len(files) == 1:
@@ -88,6 +164,35 @@ def find_resource(
         return None
 
 
+def find_resource_by_id(file_id: str) -> dict:
+    """
+    Gets resource (file, folder) on Google Drive by ID, which is faster than
+    searching for it by name.
+
+    Args:
+        file_id (str): Resource ID.
+
+    Raises:
+        PandasGoogleDriveException: Raised when no resource with the ID is accessible.
+
+    Returns:
+        dict: Dictionary containing resource `name`, `id`, `md5Checksum` (binary files
+            only) and `webViewLink`.
+    """
+
+    service = get_files()
+    request = service.get(
+        fileId=file_id,
+        fields="id, name, md5Checksum, webViewLink",
+        supportsAllDrives=True,
+    )
+
+    try:
+        return retry(request.execute)
+    except HttpError as e:
+        raise PandasGoogleDriveException(f"Unable to get file {file_id}.") from e
+
+
 def find_folder_id(
     name: str, parent_folder_id: Optional[str], drive_id: str, trashed: bool = False
 ) -> Optional[str]:
@@ -104,6 +209,11 @@ def find_folder_id(
         Optional[str]: Folder ID. Returns `None` if no folder is found.
     """
 
+    if not trashed and (
+        folder_id := get_cached_folder_id(name, parent_folder_id, drive_id)
+    ):
+        return folder_id
+
     if resource := find_resource(
         name=name,
         parent_folder_id=parent_folder_id,
@@ -111,11 +221,156 @@ def find_folder_id(
         mime_type=MIME_TYPE_FOLDER,
         trashed=trashed,
     ):
-        return resource.get("id")
+        if (folder_id := resource.get("id")) and not trashed:
+            cache_folder_id(name, parent_folder_id, drive_id, folder_id)
+
+        return folder_id
 
     return None
 
 
+def find_folders_bulk(
+    names: List[str],
+    drive_id: str,
+    parent_folder_id: Optional[str] = None,
+    trashed: bool = False,
+) -> List[Optional[List[dict]]]:
+    """
+    Finds the folders matching each of the given names. The lookups for all names
+    are sent together as one batch request, and only fetch one result page each.
+
+    Args:
+        names (List[str]): Folder names.
+        drive_id (str): Drive ID to search in.
+        parent_folder_id (Optional[str]): Folder ID the first folder must be in. If
+            None, the first folder is matched anywhere in the drive. Defaults to None.
+        trashed (bool): Search trash. Defaults to False.
+
+    Returns:
+        List[Optional[List[dict]]]: For each name, dictionaries containing folder
+            `id`, `name` and `parents`. None for names with more matches than fit in
+            one page, which should be looked up in their parent folder instead.
+    """
+
+    service = get_files()
+    requests = [
+        service.list(
+            q=(
+                f"name = '{_escape(name)}' "
+                + (
+                    f"and '{_escape(parent_folder_id)}' in parents "
+                    if parent_folder_id and not index
+                    else ""
+                )
+                + f"and trashed = {str(trashed).lower()} "
+                + f"and mimeType = '{MIME_TYPE_FOLDER}'"
+            ),
+            fields="nextPageToken, files(id, name, parents)",
+            corpora="drive",
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True,
+            driveId=drive_id,
+            pageSize=FOLDER_PAGE_SIZE,
+        )
+        for index, name in enumerate(names)
+    ]
+
+    return [
+        None if response.get("nextPageToken") else response.get("files", [])
+        for response in execute_batch(requests)
+    ]
+
+
+def find_folder_ids(
+    folders: List[str], drive_id: str, parent_folder_id: Optional[str] = None
+) -> List[str]:
+    """
+    Resolves a folder path to folder IDs. Cached folders are used first; all other
+    folders in the path are looked up together and the folder tree is walked
+    locally. Folder names too common to look up across the drive are looked up in
+    their parent folder instead.
+
+    Args:
+        folders (List[str]): List of folder names, outermost first.
+        drive_id (str): Google Drive ID.
+        parent_folder_id (Optional[str]): Folder ID of parent folder. If None, the first
+            folder is matched anywhere in the drive. Defaults to None.
+
+    Raises:
+        PandasGoogleDriveException: Raised when more than one folder matches a path
+            segment.
+
+    Returns:
+        List[str]: IDs of the leading folders in the path that exist. Shorter than
+            `folders` if a folder is missing.
+    """
+
+    folder_ids: List[str] = []
+    for name in folders:
+        if not (folder_id := get_cached_folder_id(name, parent_folder_id, drive_id)):
+            break
+
+        folder_ids.append(parent_folder_id := folder_id)
+
+    if (depth := len(folder_ids)) == len(folders):
+        return folder_ids
+
+    results = find_folders_bulk(
+        folders[depth:], drive_id=drive_id, parent_folder_id=parent_folder_id
+    )
+
+    for name, candidates in zip(folders[depth:], results):
+        if candidates is None:
+            folder_id = find_folder_id(name, parent_folder_id, drive_id)
+
+        else:
+            matches = [
+                folder
+                for folder in candidates
+                if parent_folder_id is None
+                or parent_folder_id in folder.get("parents", [])
+            ]
+
+            if len(matches) > 1:
+                raise PandasGoogleDriveException(
+                    f"{len(matches)} resources found with name: {name} "
+                    f"in parent: {parent_folder_id}."
+                )
+
+            folder_id = matches[0].get("id") if matches else None
+            if folder_id:
+                cache_folder_id(name, parent_folder_id, drive_id, folder_id)
+
+        if not folder_id:
+            break
+
+        folder_ids.append(parent_folder_id := folder_id)
+
+    return folder_ids
+
+
+def split_drive_path(path: str) -> Tuple[str, List[str], str]:
+    """
+    Splits a Google Drive path into drive name, folder names and file name.
+
+    Args:
+        path (str): Google Drive path: "drive_name/folder1/folder2/file_name.csv".
+
+    Raises:
+        PandasGoogleDriveException: Raised if the drive or file name is missing.
+
+    Returns:
+        Tuple[str, List[str], str]: Drive name, folder names and file name.
+    """
+
+    drive, _, folder_path = path.partition("/")
+    folder_path, _, file_name = folder_path.rpartition("/")
+    if not drive or not file_name:
+        raise PandasGoogleDriveException(f"Invalid path: {path}.")
+
+    return drive, folder_path.split("/") if folder_path else [], file_name
+
+
 def find_file_id(path: str, trashed: bool = False) -> Optional[str]:
     """
     Finds the ID of a file by Google Drive path.
@@ -129,17 +384,15 @@ def find_file_id(path: str, trashed: bool = False) -> Optional[str]:
         str: Google Drive ID of file described by path.
     """
 
-    drive, *folders, file_name = path.split("/")
-    if not drive or not file_name:
-        raise PandasGoogleDriveException(f"Invalid path: {path}.")
+    drive, folders, file_name = split_drive_path(path)
 
     drive_id = find_drive_id(drive)
-    parent_folder_id = None
 
-    for folder in folders:
-        parent_folder_id = find_folder_id(
-            name=folder, parent_folder_id=parent_folder_id, drive_id=drive_id
-        )
+    folder_ids = find_folder_ids(folders, drive_id=drive_id)
+    if len(folder_ids) < len(folders):
+        return None
+
+    parent_folder_id = folder_ids[-1] if folder_ids else None
 
     if resource := find_resource(
         name=file_name,
@@ -1,26 +1,123 @@
+import importlib.util
 import io
+import queue
 import re
-from typing import Optional, Tuple
+import threading
+from typing import Callable, Iterator, Optional, Tuple
 
 import pandas as pd
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload
+from googleapiclient.http import HttpRequest, MediaIoBaseDownload
 
 from .find import find_file_id
 from .service import (
+    DOWNLOAD_CHUNK_SIZE,
+    MIME_TYPE_CSV,
     MIME_TYPE_EXCEL_SPREADSHEET,
+    STREAM_CHUNK_SIZE,
     PandasGoogleDriveException,
-    get_service,
+    get_files,
+    retry,
 )
 
+GOOGLE_DRIVE_URL_PATTERN = re.compile(
+    r"/(spreadsheets|file)/d/([^&#/]*)", flags=re.IGNORECASE
+)
+
+# leading bytes of xlsx (zip archive) and xls (OLE2 compound document) files
+EXCEL_FILE_SIGNATURES = (b"PK\x03\x04", b"\xd0\xcf\x11\xe0")
+
+# CSV files are read with Arrow-backed dtypes if pyarrow is installed
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# how many downloaded chunks a stream may buffer ahead of its reader
+STREAM_QUEUE_SIZE = 2
+
+
+class _ChunkSink:
+    """
+    Write-only file-like object passing every write on to a callback.
+    """
+
+    def __init__(self, write: Callable[[bytes], None]):
+        self.write = write
+
+
+class _DownloadStream(io.RawIOBase):
+    """
+    Read-only file-like object over a Google Drive download. The file is downloaded
+    in chunks by a background thread, which stays at most `STREAM_QUEUE_SIZE`
+    chunks ahead of the reader. The download request is built by `build_request`
+    in that thread, so it uses the thread's own Drive service.
+    """
+
+    def __init__(
+        self,
+        build_request: Callable[[], HttpRequest],
+        chunksize: int = STREAM_CHUNK_SIZE,
+    ):
+        super().__init__()
+        self._chunks: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._stopped = threading.Event()
+        self._buffer = memoryview(b"")
+        self._done = False
+
+        threading.Thread(
+            target=self._download, args=(build_request, chunksize), daemon=True
+        ).start()
+
+    def _put(self, item) -> None:
+        # give up once the reader is closed, so the thread never blocks forever
+        while not self._stopped.is_set():
+            try:
+                return self._chunks.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+
+    def _download(
+        self, build_request: Callable[[], HttpRequest], chunksize: int
+    ) -> None:
+        try:
+            downloader = MediaIoBaseDownload(
+                _ChunkSink(self._put), build_request(), chunksize=chunksize
+            )
+            done = False
+            while not done and not self._stopped.is_set():
+                _, done = retry(downloader.next_chunk)
+
+            self._put(None)
+        except Exception as e:
+            self._put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and not self._done:
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._done = True
+            elif isinstance(chunk, Exception):
+                self._done = True
+                raise chunk
+            else:
+                self._buffer = memoryview(chunk)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        self._stopped.set()
+        super().close()
+
 
 def _parse_url(url: str) -> Tuple[str, str]:
     """
     Parses a Google Drive spreadsheets or file URL to extract file ID.
     """
-    GOOGLE_DRIVE_URL_PATTERN = r"/(spreadsheets|file)/d/([^&#/]*)"
-
-    if search := re.search(GOOGLE_DRIVE_URL_PATTERN, url, flags=re.IGNORECASE):
+    if search := GOOGLE_DRIVE_URL_PATTERN.search(url):
         file_type, file_id = search.groups()
         return file_type, file_id
 
@@ -34,34 +131,87 @@ def _download_file(file_url: str) -> io.BytesIO:
     NOTE: The file you want to download needs to be shared with the service account
     you are using to make the request.
     """
-    service = get_service().files()
+    service = get_files()
     file_type, file_id = _parse_url(file_url)
 
     # Google spreadsheets need to be downloaded using the export method
     if file_type == "spreadsheets":
-        return service.export(
+        request = service.export(
             fileId=file_id,
             mimeType=MIME_TYPE_EXCEL_SPREADSHEET,
-        ).execute()
+        )
+        return io.BytesIO(retry(request.execute))
 
     # all other binary media needs to use get_media, including Excel files
     file_request = service.get_media(fileId=file_id, supportsAllDrives=True)
     file_handle = io.BytesIO()
 
-    downloader = MediaIoBaseDownload(file_handle, file_request)
+    # a single ranged GET for all but very large files
+    downloader = MediaIoBaseDownload(
+        file_handle, file_request, chunksize=DOWNLOAD_CHUNK_SIZE
+    )
     done = False
     while not done:
-        _, done = downloader.next_chunk()
+        _, done = retry(downloader.next_chunk)
 
     file_handle.seek(0)
     return file_handle
 
 
-def read_drive(
-    url: Optional[str] = None, path: Optional[str] = None, **kwargs
-) -> pd.DataFrame:
+def _read_excel(file_content: io.BytesIO, **kwargs) -> pd.DataFrame:
     """
-    Reads a file from Google Drive into a Pandas DataFrame.
+    Reads Excel file content using the calamine engine if it is available, which is
+    much faster than openpyxl. Falls back to the pandas default engine otherwise.
+    """
+    if "engine" not in kwargs and file_content.read(4) in EXCEL_FILE_SIGNATURES:
+        try:
+            file_content.seek(0)
+            return pd.read_excel(file_content, engine="calamine", **kwargs)
+        except (ImportError, ValueError):
+            # python-calamine is not installed or pandas does not support it
+            pass
+
+    file_content.seek(0)
+    return pd.read_excel(file_content, **kwargs)
+
+
+def _read_csv(file_content: io.BytesIO, **kwargs) -> pd.DataFrame:
+    """
+    Reads CSV file content using the pyarrow parser and Arrow-backed dtypes if
+    pyarrow is available, which use much less memory for string columns. Falls back
+    to the pandas defaults otherwise.
+    """
+    if PYARROW_AVAILABLE:
+        try:
+            file_content.seek(0)
+            return pd.read_csv(
+                file_content,
+                **{"engine": "pyarrow", "dtype_backend": "pyarrow", **kwargs},
+            )
+        except (TypeError, ValueError):
+            # pandas < 2.0, or arguments the pyarrow parser does not support
+            pass
+
+    file_content.seek(0)
+    return pd.read_csv(file_content, **kwargs)
+
+
+def _to_dataframe(file_content: io.BytesIO, source: str, **kwargs) -> pd.DataFrame:
+    """
+    Reads downloaded file content into a DataFrame, as Excel if possible and as CSV
+    otherwise.
+    """
+    try:
+        return _read_excel(file_content, **kwargs)
+    except ValueError:
+        return _read_csv(file_content, **kwargs)
+    except Exception as e:
+        raise ValueError(f"Unable to read {source} from Google Drive.") from e
+
+
+def _resolve_url(url: Optional[str], path: Optional[str]) -> str:
+    """
+    Returns the Google Drive URL of a file given either its URL or its path.
     """
     if path is None and url is None:
         raise PandasGoogleDriveException("Must provide either path or url.")
@@ -71,21 +221,66 @@ def read_drive(
 
     if path is not None:
         if (file_id := find_file_id(path)) is not None:
-            url = f"https://docs.google.com/file/d/{file_id}"
+            return f"https://docs.google.com/file/d/{file_id}"
         else:
             raise PandasGoogleDriveException(f"Unable to find file on Drive: {path}.")
 
+    assert isinstance(url, str)
+    return url
+
+
+def read_drive(
+    url: Optional[str] = None, path: Optional[str] = None, **kwargs
+) -> pd.DataFrame:
+    """
+    Reads a file from Google Drive into a Pandas DataFrame.
+    """
+    url = _resolve_url(url, path)
+
     try:
-        assert isinstance(url, str)
         file_content = _download_file(url)
     except HttpError as e:
         raise PandasGoogleDriveException(
             f"Unable to download file: {path or url}"
         ) from e
 
-    try:
-        return pd.read_excel(file_content, **kwargs)
-    except ValueError:
-        return pd.read_csv(file_content, **kwargs)
-    except Exception as e:
-        raise ValueError(f"Unable to read {path or url} from Google Drive.") from e
+    return _to_dataframe(file_content, path or url, **kwargs)
+
+
+def iter_drive(
+    url: Optional[str] = None,
+    path: Optional[str] = None,
+    chunksize: int = 100_000,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads a CSV file from Google Drive into Pandas DataFrames of `chunksize` rows.
+    The file is parsed while it is being downloaded and is never held in memory as a
+    whole. Google spreadsheets are exported as CSV, which only includes their first
+    sheet.
+    Example:
+    >>> for df in pgdrive.iter_drive(path="drive_name/folder1/file.csv"):
+    ...     process(df)
+
+    Args:
+        url (Optional[str]): Google Drive file or spreadsheet URL.
+        path (Optional[str]): Google Drive path. First part of the path must be the
+            name of a shared Google Drive.
+        chunksize (int, optional): Rows per DataFrame. Defaults to 100_000.
+        **kwargs: Passed on to `pandas.read_csv`.
+
+    Returns:
+        Iterator[pd.DataFrame]: DataFrame chunks.
+    """
+    file_type, file_id = _parse_url(_resolve_url(url, path))
+
+    def build_request() -> HttpRequest:
+        # called from the download thread, see `_DownloadStream`
+        service = get_files()
+        if file_type == "spreadsheets":
+            return service.export_media(fileId=file_id, mimeType=MIME_TYPE_CSV)
+
+        return service.get_media(fileId=file_id, supportsAllDrives=True)
+
+    with _DownloadStream(build_request) as stream:
+        yield from pd.read_csv(io.BufferedReader(stream), chunksize=chunksize, **kwargs)
@@ -1,14 +1,25 @@
+import datetime
+import hashlib
 import json
 import os
-from typing import Optional, Union
+import random
+import tempfile
+import threading
+import time
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar, Union
 
 import googleapiclient
 import googleapiclient.discovery
 from google.oauth2 import service_account
-from googleapiclient.http import MediaFileUpload, MediaIoBaseUpload
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, MediaFileUpload, MediaIoBaseUpload
 
 PandasGoogleDriveException = Exception
 
+T = TypeVar("T")
+
 MIME_TYPE_CSV = "text/csv"
 MIME_TYPE_EXCEL_SPREADSHEET = (
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
@@ -18,6 +29,100 @@ MIME_TYPE_FOLDER = "application/vnd.google-apps.folder"
 GOOGLE_DRIVE_SCOPES = [
     "https://www.googleapis.com/auth/drive",
 ]
+# user agent of the aiohttp client in `aio`; Google APIs only gzip responses for
+# clients with "gzip" in their user agent (googleapiclient adds it on its own)
+GOOGLE_DRIVE_USER_AGENT = "pgdrive (gzip)"
+
+# Google Drive rejects (or fails) batch requests with too many sub-requests
+BATCH_SIZE = 25
+
+# files smaller than this are downloaded with a single request
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024 * 1024
+
+# chunk size for downloads that are parsed while streaming
+STREAM_CHUNK_SIZE = 8 * 1024 * 1024
+
+# uploads larger than this are resumable, sent in chunks of `UPLOAD_CHUNK_SIZE`
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# rate limiting and transient server errors, retried with exponential backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_ATTEMPTS = 6
+RETRY_MAX_DELAY = 32
+RATE_LIMIT_REASONS = (b"rateLimitExceeded", b"userRateLimitExceeded")
+
+# access tokens are cached on disk until shortly before they expire
+TOKEN_EXPIRY_MARGIN = datetime.timedelta(seconds=60)
+
+_thread_local = threading.local()
+
+
+class _TokenCacheCredentials(service_account.Credentials):
+    """
+    Service account credentials that keep their access token in a local file, so
+    short-lived processes can reuse a valid token instead of requesting a new one.
+    """
+
+    def _token_path(self) -> Optional[Path]:
+        try:
+            cache_dir = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+        except (RuntimeError, KeyError):
+            return None  # no home directory, e.g. containers running arbitrary UIDs
+
+        key = f"{self.service_account_email}:{' '.join(sorted(self.scopes or []))}"
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return cache_dir / "pgdrive" / f"token-{digest}.json"
+
+    def _load_token(self) -> bool:
+        if (path := self._token_path()) is None:
+            return False
+
+        try:
+            cached = json.loads(path.read_text())
+            token = cached["token"]
+            expiry = datetime.datetime.fromisoformat(cached["expiry"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        # google-auth uses naive UTC datetimes for token expiry
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        if expiry - TOKEN_EXPIRY_MARGIN < now:
+            return False
+
+        # refreshing with a token already in use means it was rejected (e.g. revoked)
+        if token == self.token:
+            return False
+
+        self.token, self.expiry = token, expiry
+        return True
+
+    def _store_token(self) -> None:
+        if (path := self._token_path()) is None:
+            return
+
+        try:
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+            # write to a private temporary file, then atomically move it in place
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".token-")
+            cached = {"token": self.token, "expiry": self.expiry.isoformat()}
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(cached, f)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            pass  # the token cache is best effort, e.g. on read-only file systems
+
+    def refresh(self, request) -> None:
+        if self._load_token():
+            return
+
+        super().refresh(request)
+        self._store_token()
 
 
 def get_credentials() -> dict:
@@ -27,13 +132,148 @@ def get_credentials() -> dict:
         raise ValueError("Missing environment variable GOOGLE_DRIVE_CREDENTIALS")
 
 
-def get_service():
-    credentials = service_account.Credentials.from_service_account_info(
+@lru_cache(maxsize=1)
+def get_service_credentials() -> service_account.Credentials:
+    """
+    Builds the service account credentials once per process, so access tokens are
+    shared by all requests. Tokens are also cached on disk and reused across
+    processes, unless `GOOGLE_DRIVE_TOKEN_CACHE` is set to "0".
+    """
+
+    credentials_class = (
+        service_account.Credentials
+        if os.getenv("GOOGLE_DRIVE_TOKEN_CACHE") == "0"
+        else _TokenCacheCredentials
+    )
+
+    return credentials_class.from_service_account_info(
         get_credentials(),
         scopes=GOOGLE_DRIVE_SCOPES,
     )
 
-    return googleapiclient.discovery.build("drive", "v3", credentials=credentials)
+
+def get_service():
+    """
+    Builds the Google Drive service once per thread (the underlying httplib2
+    connections are not thread-safe); credential parsing, token signing and
+    discovery are not repeated on every request.
+    """
+
+    if (service := getattr(_thread_local, "service", None)) is not None:
+        return service
+
+    _thread_local.service = googleapiclient.discovery.build(
+        "drive", "v3", credentials=get_service_credentials()
+    )
+    return _thread_local.service
+
+
+def get_files():
+    """
+    Returns the (per-thread cached) files collection of the Google Drive service.
+    """
+
+    if (files := getattr(_thread_local, "files", None)) is None:
+        files = _thread_local.files = get_service().files()
+
+    return files
+
+
+def is_transient(status: int, content: Optional[bytes]) -> bool:
+    """
+    Whether a failed request is worth retrying, given its response status and body.
+    """
+    if status in RETRY_STATUSES:
+        return True
+
+    # Google Drive also reports rate limiting as 403 errors
+    return status == 403 and any(
+        reason in (content or b"") for reason in RATE_LIMIT_REASONS
+    )
+
+
+def retry_delay(attempt: int, retry_after: Optional[str], base: float = 0.5) -> float:
+    """
+    Seconds to wait before retry number `attempt` (starting at 1): exponential
+    backoff with jitter, or the `Retry-After` response header if that is longer.
+    """
+    delay = min(RETRY_MAX_DELAY, base * 2 ** (attempt - 1)) + random.random()
+
+    try:
+        return max(delay, float(retry_after or 0))
+    except ValueError:  # Retry-After given as an HTTP date
+        return delay
+
+
+def retry(fn: Callable[[], T], attempts: int = RETRY_ATTEMPTS, base: float = 0.5) -> T:
+    """
+    Calls `fn`, retrying rate limited and transient Google Drive errors with
+    exponential backoff and jitter. A `Retry-After` response header takes precedence
+    over shorter backoff delays.
+
+    Args:
+        fn (Callable[[], T]): Function to call, usually a request's `execute` method.
+        attempts (int, optional): Maximum number of calls. Defaults to 6.
+        base (float, optional): Delay in seconds before the first retry, doubled on
+            each further retry. Defaults to 0.5.
+
+    Raises:
+        HttpError: Raised when the error is not transient or all attempts fail.
+
+    Returns:
+        T: Return value of `fn`.
+    """
+
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except HttpError as e:
+            attempt += 1
+            if attempt >= attempts or not is_transient(e.resp.status, e.content):
+                raise
+
+            time.sleep(retry_delay(attempt, e.resp.get("retry-after"), base=base))
+
+
+def execute_batch(requests: List[HttpRequest]) -> List[dict]:
+    """
+    Executes Google Drive HttpRequests as batch requests of at most `BATCH_SIZE`
+    requests each, sending each batch in a single HTTP call.
+
+    Args:
+        requests (List[HttpRequest]): Requests to execute.
+
+    Raises:
+        HttpError: Raised when any of the requests fails, after retries.
+
+    Returns:
+        List[dict]: Request responses, in request order.
+    """
+
+    responses: Dict[str, dict] = {}
+
+    def execute(indices: range) -> None:
+        errors: List[Exception] = []
+
+        def callback(request_id: str, response: dict, exception: Optional[Exception]):
+            if exception is not None:
+                errors.append(exception)
+            else:
+                responses[request_id] = response
+
+        batch = get_service().new_batch_http_request(callback=callback)
+        for index in indices:
+            batch.add(requests[index], request_id=str(index))
+
+        batch.execute()
+        if errors:
+            raise errors[0]
+
+    for offset in range(0, len(requests), BATCH_SIZE):
+        retry(partial(execute, range(offset, min(offset + BATCH_SIZE, len(requests)))))
+
+    return [responses[str(index)] for index in range(len(requests))]
 
 
 def create(
@@ -42,6 +282,7 @@ def create(
     drive_id: str,
     mime_type: Optional[str] = None,
     media: Optional[Union[MediaFileUpload, MediaIoBaseUpload]] = None,
+    fields: str = "id,webViewLink",
 ) -> dict:
     """
     Executes Google Drive HttpRequest to create/upload resources (files,
@@ -55,6 +296,8 @@ def create(
         mime_type (Optional[str], optional): Type of resource to create.
         media (Optional[Union[MediaFileUpload, MediaIoBaseUpload]], optional):
             When uploading files, the file content.
+        fields (str, optional): Resource fields to include in the response.
+            Defaults to "id,webViewLink".
 
     Returns:
         dict: Request response.
@@ -67,10 +310,11 @@ def create(
         "mimeType": mime_type,
     }
 
-    service = get_service().files()
-    return service.create(
-        body=metadata, media_body=media, fields="id,webViewLink", supportsAllDrives=True
-    ).execute()
+    service = get_files()
+    request = service.create(
+        body=metadata, media_body=media, fields=fields, supportsAllDrives=True
+    )
+    return retry(request.execute)
 
 
 def update(
@@ -88,10 +332,11 @@ def update(
         dict: Request response.
     """
 
-    service = get_service().files()
-    return service.update(
+    service = get_files()
+    request = service.update(
         fileId=file_id,
         media_body=media,
         fields="id,webViewLink",
         supportsAllDrives=True,
-    ).execute()
+    )
+    return retry(request.execute)
@@ -3,8 +3,13 @@ from typing import Union
 
 from googleapiclient.http import MediaFileUpload
 
-from .find import find_drive_id
-from .service import PandasGoogleDriveException, create
+from .find import find_drive_id, split_drive_path
+from .service import (
+    RESUMABLE_UPLOAD_THRESHOLD,
+    UPLOAD_CHUNK_SIZE,
+    PandasGoogleDriveException,
+    create,
+)
 from .write import create_folders
 
 
@@ -25,9 +30,7 @@ def upload_file(local_path: Union[str, Path], drive_path: str) -> str:
     if not local_path.exists():
         raise FileNotFoundError(f"File {local_path} does not exist.")
 
-    drive, *folders, file_name = drive_path.split("/")
-    if not drive or not file_name:
-        raise PandasGoogleDriveException(f"Invalid path: {drive_path}.")
+    drive, folders, file_name = split_drive_path(drive_path)
 
     drive_id = find_drive_id(drive)
     parent_folder_id = create_folders(folders, drive_id=drive_id)
@@ -36,7 +39,11 @@ def upload_file(local_path: Union[str, Path], drive_path: str) -> str:
         name=file_name,
         parent_folder_id=parent_folder_id,
         drive_id=drive_id,
-        media=MediaFileUpload(local_path, resumable=False),
+        media=MediaFileUpload(
+            local_path,
+            chunksize=UPLOAD_CHUNK_SIZE,
+            resumable=local_path.stat().st_size > RESUMABLE_UPLOAD_THRESHOLD,
+        ),
     )
 
     if not response:
@@ -1,41 +1,97 @@
+import hashlib
 import io
+import tempfile
+import threading
 from typing import List, Optional
 
 import pandas as pd
 from googleapiclient.http import MediaIoBaseUpload
 
-from .find import find_drive_id, find_folder_id, find_resource
+from .find import (
+    cache_folder_id,
+    find_drive_id,
+    find_folder_id,
+    find_folder_ids,
+    find_resource,
+    find_resource_by_id,
+    get_cached_folder_id,
+    split_drive_path,
+)
 from .service import (
     MIME_TYPE_CSV,
     MIME_TYPE_EXCEL_SPREADSHEET,
     MIME_TYPE_FOLDER,
+    RESUMABLE_UPLOAD_THRESHOLD,
+    UPLOAD_CHUNK_SIZE,
     PandasGoogleDriveException,
     create,
     update,
 )
 
+# serializes concurrent creation of the same folder, see `create_folders`; a
+# fixed pool of locks shared between folders keeps memory use bounded
+FOLDER_LOCK_COUNT = 64
+_folder_locks = [threading.Lock() for _ in range(FOLDER_LOCK_COUNT)]
+
+# read media content in chunks of this size when computing checksums
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
 
 def _setup_media(df: pd.DataFrame, path: str, **kwargs) -> MediaIoBaseUpload:
     """
-    Creates MediaIoBaseUpload object with appropriate mime type.
+    Creates MediaIoBaseUpload object with appropriate mime type. Small files are
+    serialized in memory, larger ones are spooled to a temporary file so uploads
+    only hold one chunk in memory at a time.
     """
 
-    buffer_: Optional[io.IOBase] = None
+    buffer_ = tempfile.SpooledTemporaryFile(max_size=RESUMABLE_UPLOAD_THRESHOLD)
 
     if path.endswith(".csv"):
         mime_type = MIME_TYPE_CSV
-        buffer_ = io.StringIO()
         df.to_csv(buffer_, **kwargs)
 
     elif path.endswith(".xlsx"):
         mime_type = MIME_TYPE_EXCEL_SPREADSHEET
-        buffer_ = io.BytesIO()
         df.to_excel(buffer_, **kwargs)
 
     else:
+        buffer_.close()
         raise PandasGoogleDriveException(f"Unsupported file type: {path}.")
 
-    return MediaIoBaseUpload(buffer_, resumable=False, mimetype=mime_type)
+    return MediaIoBaseUpload(
+        buffer_,
+        mimetype=mime_type,
+        chunksize=UPLOAD_CHUNK_SIZE,
+        resumable=buffer_.seek(0, io.SEEK_END) > RESUMABLE_UPLOAD_THRESHOLD,
+    )
+
+
+def _md5_checksum(media: MediaIoBaseUpload) -> str:
+    """
+    Computes the MD5 checksum of media content, as reported by Google Drive for
+    binary files. Only meaningful for CSV content, as written Excel files contain
+    timestamps.
+    """
+
+    try:
+        md5 = hashlib.md5(usedforsecurity=False)  # type: ignore[call-arg]
+    except TypeError:  # Python < 3.9
+        md5 = hashlib.md5()
+
+    for offset in range(0, media.size(), CHECKSUM_CHUNK_SIZE):
+        md5.update(media.getbytes(offset, CHECKSUM_CHUNK_SIZE))
+
+    return md5.hexdigest()
+
+
+def _folder_lock(
+    name: str, parent_folder_id: Optional[str], drive_id: str
+) -> threading.Lock:
+    """
+    Returns the lock guarding the creation of a folder in the given parent folder.
+    """
+
+    return _folder_locks[hash((name, parent_folder_id, drive_id)) % FOLDER_LOCK_COUNT]
 
 
 def create_folder(
@@ -64,13 +120,17 @@ def create_folder(
     ):
         return folder_id
 
-    if response := create(
+    response = create(
         name=name,
         parent_folder_id=parent_folder_id,
         drive_id=drive_id,
         mime_type=MIME_TYPE_FOLDER,
-    ):
-        return response.get("id")
+        fields="id",
+    )
+
+    if response and (folder_id := response.get("id")):
+        cache_folder_id(name, parent_folder_id, drive_id, folder_id)
+        return folder_id
     else:
         raise PandasGoogleDriveException(f"Unable to create folder {name}.")
 
@@ -95,18 +155,78 @@ def create_folders(
         str: Google Drive ID of last folder in list.
     """
 
-    for folder in folders:
-        parent_folder_id = create_folder(
-            name=folder,
-            parent_folder_id=parent_folder_id,
-            drive_id=drive_id,
-            exist_ok=exist_ok,
-        )
+    folder_ids = (
+        find_folder_ids(folders, drive_id=drive_id, parent_folder_id=parent_folder_id)
+        if exist_ok
+        else []
+    )
+    if depth := len(folder_ids):
+        parent_folder_id = folder_ids[-1]
+
+    # once a folder is missing, none of its descendants can exist
+    for folder in folders[depth:]:
+        with _folder_lock(folder, parent_folder_id, drive_id):
+            # another thread may have created the folder in the meantime
+            cached_folder_id = (
+                get_cached_folder_id(folder, parent_folder_id, drive_id)
+                if exist_ok
+                else None
+            )
+            parent_folder_id = cached_folder_id or create_folder(
+                name=folder,
+                parent_folder_id=parent_folder_id,
+                drive_id=drive_id,
+                exist_ok=False,
+            )
 
     return parent_folder_id
 
 
-def to_drive(df: pd.DataFrame, path: str, overwrite: bool = False, **kwargs) -> str:
+def _overwrite(resource: dict, media: MediaIoBaseUpload, path: str) -> dict:
+    """
+    Updates the content of an existing file, unless it is unchanged.
+    """
+
+    # content is unchanged, no need to upload it again; Excel files embed the
+    # time they were written, so their checksum changes on every write
+    checksum = resource.get("md5Checksum")
+    if (
+        checksum
+        and media.mimetype() == MIME_TYPE_CSV
+        and checksum == _md5_checksum(media)
+    ):
+        return resource
+
+    if not (resource_id := resource.get("id")):
+        raise PandasGoogleDriveException(
+            f"File ID for {path} not found when attempting update."
+        )
+
+    return update(file_id=resource_id, media=media)
+
+
+def _file_url(response: Optional[dict], path: str) -> str:
+    """
+    Gets the URL of a written file from the create or update response.
+    """
+
+    if not response:
+        raise PandasGoogleDriveException(f"Unable to write to {path}.")
+
+    file_url = response.get("webViewLink")
+    if not file_url or not isinstance(file_url, str):
+        raise PandasGoogleDriveException(f"Unable to get uploaded file URL for {path}.")
+
+    return file_url
+
+
+def to_drive(
+    df: pd.DataFrame,
+    path: str,
+    overwrite: bool = False,
+    file_id: Optional[str] = None,
+    **kwargs,
+) -> str:
     """
     Write a DataFrame to a file on Google Drive, in the specified parent folder.
     Example:
@@ -116,7 +236,12 @@ def to_drive(df: pd.DataFrame, path: str, overwrite: bool = False, **kwargs) ->
     Args:
         df (pd.DataFrame): DataFrame to write.
         path (str): Path to write to. First part of path is the drive name.
-        overwrite (bool, optional): Overwrite existing file. Defaults to False.
+        overwrite (bool, optional): Overwrite existing file. Defaults to False. For CSV
+            files, the upload is skipped if the existing file has the same content.
+            Excel files are always uploaded, as they include the time of writing.
+        file_id (Optional[str], optional): ID of an existing file to overwrite, e.g.
+            from a previous write. The file is updated in place without looking up
+            `path`, which then only determines the file type. Defaults to None.
 
     Raises:
         PandasGoogleDriveException: Raised if `overwrite` is False and file exists.
@@ -127,25 +252,25 @@ def to_drive(df: pd.DataFrame, path: str, overwrite: bool = False, **kwargs) ->
         str: Google Drive file URL.
     """
 
-    drive, *folders, file_name = path.split("/")
-    if not drive or not file_name:
-        raise PandasGoogleDriveException(f"Invalid path: {path}.")
+    resource: Optional[dict]
+
+    if file_id is not None:
+        resource = find_resource_by_id(file_id)
+        media = _setup_media(df, path, **kwargs)
+        return _file_url(_overwrite(resource, media, path), path)
+
+    drive, folders, file_name = split_drive_path(path)
 
     drive_id = find_drive_id(drive)
     parent_folder_id = create_folders(folders, drive_id=drive_id)
 
-    media = _setup_media(df, path, **kwargs)
-    if resource := find_resource(file_name, parent_folder_id, drive_id):
-        if not overwrite:
-            raise PandasGoogleDriveException(f"File {path} already exists.")
-
-        if file_id := resource.get("id"):
-            response = update(file_id=file_id, media=media)
-        else:
-            raise PandasGoogleDriveException(
-                f"File ID for {path} not found when attempting update."
-            )
+    resource = find_resource(file_name, parent_folder_id, drive_id)
+    if resource and not overwrite:
+        raise PandasGoogleDriveException(f"File {path} already exists.")
 
+    media = _setup_media(df, path, **kwargs)
+    if resource:
+        response = _overwrite(resource, media, path)
     else:
         response = create(
             name=file_name,
@@ -154,11 +279,4 @@ def to_drive(df: pd.DataFrame, path: str, overwrite: bool = False, **kwargs) ->
             media=media,
         )
 
-    if not response:
-        raise PandasGoogleDriveException(f"Unable to write to {path}.")
-
-    file_url = response.get("webViewLink")
-    if not file_url or not isinstance(file_url, str):
-        raise PandasGoogleDriveException(f"Unable to get uploaded file URL for {path}.")
-
-    return file_url
+    return _file_url(response, path)
@@ -6,10 +6,15 @@ from os import path
 from setuptools import find_packages, setup
 
 requirements = [
-    "pandas>=1.0",
+    "pandas>=1.3",
     "google-api-python-client>=2.0",
     "openpyxl>=3.0",
 ]
+extra_requirements = {
+    "aio": ["aiohttp>=3.7", "google-auth-httplib2", "httplib2"],
+    "calamine": ["pandas>=2.2", "python-calamine"],
+    "pyarrow": ["pandas>=2.0", "pyarrow"],
+}
 test_requirements = ["pytest"]
 
 here = path.abspath(path.dirname(__file__))
@@ -28,6 +33,7 @@ setup(
     ],
     description="pgdrive lets you read and write DataFrames from and to Google Drive.",
     install_requires=requirements,
+    extras_require=extra_requirements,
     license="MIT license",
     long_description=long_description,
     long_description_content_type="text/markdown",
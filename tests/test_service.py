@@ -0,0 +1,85 @@
+import datetime
+import json
+from unittest import mock
+
+import pytest
+from google.oauth2 import service_account
+
+from pgdrive import service
+
+
+@pytest.fixture
+def credentials(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return service._TokenCacheCredentials(
+        mock.Mock(),
+        "pgdrive@example.iam.gserviceaccount.com",
+        "https://oauth2.googleapis.com/token",
+        scopes=service.GOOGLE_DRIVE_SCOPES,
+    )
+
+
+def write_cached_token(credentials, token):
+    expiry = datetime.datetime.now(datetime.timezone.utc).replace(
+        tzinfo=None
+    ) + datetime.timedelta(hours=1)
+    path = credentials._token_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"token": token, "expiry": expiry.isoformat()}))
+
+
+def fake_refresh(credentials, request):
+    credentials.token = "fresh-token"
+    credentials.expiry = datetime.datetime.now(datetime.timezone.utc).replace(
+        tzinfo=None
+    ) + datetime.timedelta(hours=1)
+
+
+def test_refresh_uses_cached_token(credentials):
+    write_cached_token(credentials, "cached-token")
+
+    with mock.patch.object(
+        service_account.Credentials, "refresh", autospec=True
+    ) as parent_refresh:
+        credentials.refresh(mock.Mock())
+
+    parent_refresh.assert_not_called()
+    assert credentials.token == "cached-token"
+
+
+def test_refresh_replaces_rejected_cached_token(credentials):
+    write_cached_token(credentials, "cached-token")
+    credentials.token = "cached-token"
+
+    with mock.patch.object(
+        service_account.Credentials,
+        "refresh",
+        autospec=True,
+        side_effect=fake_refresh,
+    ) as parent_refresh:
+        credentials.refresh(mock.Mock())
+
+    parent_refresh.assert_called_once()
+    assert credentials.token == "fresh-token"
+    assert json.loads(credentials._token_path().read_text())["token"] == "fresh-token"
+
+
+def test_refresh_without_home_directory(credentials, monkeypatch):
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setattr(
+        service.Path,
+        "home",
+        mock.Mock(side_effect=RuntimeError("Could not determine home directory.")),
+    )
+
+    with mock.patch.object(
+        service_account.Credentials,
+        "refresh",
+        autospec=True,
+        side_effect=fake_refresh,
+    ) as parent_refresh:
+        credentials.refresh(mock.Mock())
+
+    parent_refresh.assert_called_once()
+    assert credentials._token_path() is None
+    assert credentials.token == "fresh-token"